@@ -69,14 +69,18 @@ class CaptureGameState(AbstractGameState):
 
         # Build some denormalized structures for fast access.
 
-        self._redCapsules = []
-        self._blueCapsules = []
+        redCapsules = []
+        blueCapsules = []
 
         for capsule in self.getCapsules():
             if (self.isOnRedSide(capsule)):
-                self._redCapsules.append(capsule)
+                redCapsules.append(capsule)
             else:
-                self._blueCapsules.append(capsule)
+                blueCapsules.append(capsule)
+
+        # Frozensets, like the base capsule set, so successors share storage.
+        self._redCapsules = frozenset(redCapsules)
+        self._blueCapsules = frozenset(blueCapsules)
 
         self._redFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
         self._blueFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
@@ -111,16 +115,15 @@ class CaptureGameState(AbstractGameState):
 
     # Override
     def eatCapsule(self, x, y):
-        if (not self._capsulesCopied):
-            self._redCapsules = self._redCapsules.copy()
-            self._blueCapsules = self._blueCapsules.copy()
-
-        super().eatCapsule(x, y)
+        if (not super().eatCapsule(x, y)):
+            return False
 
         if (self.isOnRedSide((x, y))):
-            self._redCapsules.remove((x, y))
+            self._redCapsules = self._redCapsules - {(x, y)}
         else:
-            self._blueCapsules.remove((x, y))
+            self._blueCapsules = self._blueCapsules - {(x, y)}
+
+        return True
 
     # Override
     def eatFood(self, x, y):
@@ -132,13 +135,14 @@ class CaptureGameState(AbstractGameState):
 
         if (self.isOnRedSide((x, y))):
             self._redFood[x][y] = False
+            self._redFood.clearCaches()
         else:
             self._blueFood[x][y] = False
+            self._blueFood.clearCaches()
 
     def getBlueCapsules(self):
         """
-        Get a list of remaining capsules on the blue side.
-        The caller should not modify the list.
+        Get the remaining capsules on the blue side as a frozenset.
         """
 
         return self._blueCapsules
@@ -163,8 +167,7 @@ class CaptureGameState(AbstractGameState):
 
     def getRedCapsules(self):
         """
-        Get a list of remaining capsules on the red side.
-        The caller should not modify the list.
+        Get the remaining capsules on the red side as a frozenset.
         """
 
         return self._redCapsules
@@ -232,7 +235,7 @@ class CaptureGameState(AbstractGameState):
         # Find appropriate rules for the agent.
         AgentRules.applyAction(self, action, agentIndex)
         AgentRules.checkDeath(self, agentIndex)
-        AgentRules.decrementTimer(self.getAgentState(agentIndex))
+        AgentRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Book keeping.
         self._lastAgentMoved = agentIndex
@@ -355,7 +358,7 @@ class AgentRules:
         if (action not in legal):
             raise ValueError('Illegal action: ' + str(action))
 
-        agentState = state.getAgentState(agentIndex)
+        agentState = state.getMutableAgentState(agentIndex)
 
         # Update position.
         vector = Actions.directionToVector(action, AgentRules.AGENT_SPEED)
@@ -414,7 +417,7 @@ class AgentRules:
                 otherTeam = state.getRedTeamIndices()
 
             for agentIndex in otherTeam:
-                state.getAgentState(agentIndex).setScaredTimer(SCARED_TIME)
+                state.getMutableAgentState(agentIndex).setScaredTimer(SCARED_TIME)
 
     @staticmethod
     def decrementTimer(agentState):
@@ -455,10 +458,10 @@ class AgentRules:
             # Otherwise, we are being eatten.
             if (agentState.isBraveGhost() or otherAgentState.isScaredGhost()):
                 state.addScore(teamPointModifier * KILL_POINTS)
-                otherAgentState.respawn()
+                state.getMutableAgentState(otherAgentIndex).respawn()
             else:
                 state.addScore(teamPointModifier * -KILL_POINTS)
-                agentState.respawn()
+                state.getMutableAgentState(agentIndex).respawn()
 
 #############################
 # FRAMEWORK TO START A GAME #
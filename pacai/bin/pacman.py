@@ -134,7 +134,7 @@ class PacmanGameState(AbstractGameState):
             # Penalty for waiting around.
             self.addScore(-TIME_PENALTY)
         else:
-            GhostRules.decrementTimer(self.getAgentState(agentIndex))
+            GhostRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Resolve multi-agent effects.
         GhostRules.checkDeath(self, agentIndex)
@@ -230,7 +230,7 @@ class PacmanRules:
         if (action not in legal):
             raise ValueError('Illegal pacman action: ' + str(action))
 
-        pacmanState = state.getPacmanState()
+        pacmanState = state.getMutableAgentState(PACMAN_AGENT_INDEX)
 
         # Update position.
         vector = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
@@ -260,8 +260,8 @@ class PacmanRules:
             state.eatCapsule(x, y)
 
             # Reset all ghosts' scared timers.
-            for ghostState in state.getGhostStates():
-                ghostState.setScaredTimer(SCARED_TIME)
+            for index in state.getGhostIndexes():
+                state.getMutableAgentState(index).setScaredTimer(SCARED_TIME)
 
 class GhostRules:
     """
@@ -296,7 +296,7 @@ class GhostRules:
         if (action not in legal):
             raise ValueError('Illegal ghost action: ' + str(action))
 
-        ghostState = state.getGhostState(ghostIndex)
+        ghostState = state.getMutableAgentState(ghostIndex)
         speed = GhostRules.GHOST_SPEED
         if (ghostState.isScared()):
             speed /= 2.0
@@ -341,7 +341,7 @@ class GhostRules:
         if (ghostState.isScared()):
             # Pacman ate a ghost.
             state.addScore(GHOST_POINTS)
-            ghostState.respawn()
+            state.getMutableAgentState(agentIndex).respawn()
         elif (not state.isOver()):
             # A ghost ate pacman.
             state.addScore(LOSE_POINTS)
@@ -23,6 +23,10 @@ class AgentState:
         self._isPacman = isPacman
         self._scaredTimer = 0
 
+        # Cache for the int-cast position tuple handed out by getIntPosition().
+        # Any mutation of the position must clear it.
+        self._intPositionCache = None
+
     def copy(self):
         state = AgentState(self._startPosition, self._startDirection, self._startIsPacman)
 
@@ -30,6 +34,7 @@ class AgentState:
         state._position = self._position
         state._direction = self._direction
         state._scaredTimer = self._scaredTimer
+        state._intPositionCache = self._intPositionCache
 
         return state
 
@@ -42,6 +47,22 @@ class AgentState:
     def getPosition(self):
         return self._position
 
+    def getIntPosition(self):
+        """
+        Get this agent's position with the coordinates cast to ints,
+        or None if the position is unknown.
+        The tuple is cached and shared between calls (and copies),
+        so callers avoid allocating a fresh tuple per query.
+        """
+
+        if (self._intPositionCache is None):
+            if (self._position is None):
+                return None
+
+            self._intPositionCache = (int(self._position[0]), int(self._position[1]))
+
+        return self._intPositionCache
+
     def getNearestPosition(self):
         return util.nearestPoint(self._position)
 
@@ -79,6 +100,7 @@ class AgentState:
         """
 
         self._position = util.nearestPoint(self._position)
+        self._intPositionCache = None
 
     def respawn(self):
         """
@@ -89,6 +111,7 @@ class AgentState:
         self._direction = self._startDirection
         self._isPacman = self._startIsPacman
         self._scaredTimer = 0
+        self._intPositionCache = None
 
     def updatePosition(self, vector):
         """
@@ -99,6 +122,7 @@ class AgentState:
         dx, dy = vector
 
         self._position = (x + dx, y + dy)
+        self._intPositionCache = None
 
         direction = Actions.vectorToDirection(vector)
         if (direction != Directions.STOP):
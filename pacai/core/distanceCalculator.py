@@ -1,7 +1,7 @@
+import collections
 import sys
 
 from pacai.core.distance import manhattan
-from pacai.util import priorityQueue
 
 DEFAULT_DISTANCE = 10000
 
@@ -48,11 +48,27 @@ class Distancer(object):
         return bestDistance
 
     def getDistanceOnGrid(self, pos1, pos2):
-        key = (pos1, pos2)
-        if key in self._distances:
-            return self._distances[key]
+        row = self._distances.get(pos2)
+        if (row is not None):
+            distance = row.get(pos1)
+            if (distance is not None):
+                return distance
 
-        raise Exception("Position not in grid: " + str(key))
+        raise Exception("Position not in grid: " + str((pos1, pos2)))
+
+    def getDistancesFrom(self, pos):
+        """
+        Get a dict mapping every grid position to its maze distance from pos,
+        or None if distances have not been computed or pos is not on the grid.
+        This serves bulk queries from a common source with one dict lookup per target,
+        instead of a getDistance() call apiece.
+        The dict is shared, so the caller should not modify it.
+        """
+
+        if (self._distances is None):
+            return None
+
+        return self._distances.get(pos)
 
     def isReadyForMazeDistance(self):
         return (self._distances is not None)
@@ -94,63 +110,46 @@ class DistanceCalculator:
 
 def computeDistances(layout):
     """
-    Runs UCS to all other positions from each position.
+    Runs BFS to all other positions from each position.
+    Every step costs one, so a plain FIFO queue visits nodes in distance order
+    without the heap operations (and re-pushes) a priority queue pays.
+    Distances are stored as one dict per source position (mapping target to distance),
+    so all distances from a common source can be fetched as a single row.
     """
 
     distances = {}
     allNodes = layout.walls.asList(False)
+    walls = layout.walls
 
     for source in allNodes:
-        dist = {}
-        closed = {}
-
-        for node in allNodes:
-            dist[node] = sys.maxsize
+        dist = {source: 0}
+        queue = collections.deque([source])
 
-        queue = priorityQueue.PriorityQueue()
-        queue.push(source, 0)
-        dist[source] = 0
-
-        while not queue.isEmpty():
-            node = queue.pop()
-            if node in closed:
-                continue
-
-            closed[node] = True
-            nodeDist = dist[node]
-            adjacent = []
+        while queue:
+            node = queue.popleft()
+            nodeDist = dist[node] + 1
             x, y = node
 
-            if not layout.isWall((x, y + 1)):
-                adjacent.append((x, y + 1))
-
-            if not layout.isWall((x, y - 1)):
-                adjacent.append((x, y - 1))
-
-            if not layout.isWall((x + 1, y)):
-                adjacent.append((x + 1, y))
+            for other in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if (other not in dist and not walls[other[0]][other[1]]):
+                    dist[other] = nodeDist
+                    queue.append(other)
 
-            if not layout.isWall((x - 1, y)):
-                adjacent.append((x - 1, y))
-
-            for other in adjacent:
-                if other not in dist:
-                    continue
-
-                oldDist = dist[other]
-                newDist = nodeDist + 1
-                if newDist < oldDist:
-                    dist[other] = newDist
-                    queue.push(other, newDist)
+        # Keep the historical convention that unreachable positions
+        # are still present, with an effectively-infinite distance.
+        for node in allNodes:
+            if node not in dist:
+                dist[node] = sys.maxsize
 
-        for target in allNodes:
-            distances[(target, source)] = dist[target]
+        distances[source] = dist
 
     return distances
 
 def getDistanceOnGrid(distances, pos1, pos2):
-    key = (pos1, pos2)
-    if key in distances:
-        return distances[key]
+    row = distances.get(pos2)
+    if (row is not None):
+        distance = row.get(pos1)
+        if (distance is not None):
+            return distance
 
     return DEFAULT_DISTANCE
@@ -1,10 +1,29 @@
 import abc
-import copy
+import random
 
 from pacai.core.agentstate import AgentState
 from pacai.core.directions import Directions
 from pacai.util import util
 
+# Zobrist-style hash keys.
+# Each distinct board item (a food pellet or capsule at some location,
+# or an agent in some configuration) gets a stable random 64-bit key,
+# generated lazily so that boards of any size are supported.
+# States then maintain their hash incrementally by XORing keys in and out
+# as items change, instead of rehashing every collection on each call.
+_ZOBRIST_KEYS = {}
+
+# Use a private generator so key generation does not disturb the game's RNG.
+_ZOBRIST_RANDOM = random.Random(20221013)
+
+def _zobristKey(*components):
+    key = _ZOBRIST_KEYS.get(components)
+    if (key is None):
+        key = _ZOBRIST_RANDOM.getrandbits(64)
+        _ZOBRIST_KEYS[components] = key
+
+    return key
+
 class AbstractGameState(abc.ABC):
     """
     A game state specifies the status of a game, including the food, capsules, agents, and score.
@@ -22,6 +41,10 @@ class AbstractGameState(abc.ABC):
 
         self._layout = layout
 
+        # The layout never changes and is shared by every successor,
+        # so its hash contribution is computed exactly once.
+        self._layoutHash = hash(layout)
+
         # Keep a copy of the hash, since it is expensive to compute.
         # Any children should be sure to clear the hash when modifications are made.
         self._hash = None
@@ -33,8 +56,10 @@ class AbstractGameState(abc.ABC):
         self._food = layout.food.copy()
         self._lastFoodEaten = None
 
-        self._capsulesCopied = False
-        self._capsules = layout.capsules.copy()
+        # Capsules live in a frozenset.
+        # "Removing" one just rebinds to a smaller set,
+        # so successors share storage and membership tests are O(1).
+        self._capsules = frozenset(layout.capsules)
         self._lastCapsuleEaten = None
 
         # An ordered list of locations that this state considers special.
@@ -45,8 +70,23 @@ class AbstractGameState(abc.ABC):
         for (isPacman, position) in layout.agentPositions:
             self._agentStates.append(AgentState(position, Directions.STOP, isPacman))
 
+        # Like food and capsules, agent states are only copied on write.
+        # A fresh state owns all of its agent states.
+        self._agentsCopied = [True] * len(self._agentStates)
+
         self._score = 0
 
+        # The XOR of the Zobrist keys for every food and capsule currently on the board.
+        # eatFood() and eatCapsule() keep this up-to-date by XORing out the eaten item,
+        # so __hash__ never has to walk the food grid.
+        self._zobristItems = 0
+
+        for position in self._food.asList():
+            self._zobristItems ^= _zobristKey('food', position)
+
+        for position in self._capsules:
+            self._zobristItems ^= _zobristKey('capsule', position)
+
     @abc.abstractmethod
     def generateSuccessor(self, agentIndex, action):
         """
@@ -76,13 +116,11 @@ class AbstractGameState(abc.ABC):
         if (not self.hasCapsule(x, y)):
             return False
 
-        if (not self._capsulesCopied):
-            self._capsules = self._capsules.copy()
-            self._capsulesCopied = True
-
-        self._capsules.remove((x, y))
+        self._capsules = self._capsules - {(x, y)}
         self._lastCapsuleEaten = (x, y)
 
+        self._zobristItems ^= _zobristKey('capsule', (x, y))
+
         self._hash = None
         return True
 
@@ -99,8 +137,11 @@ class AbstractGameState(abc.ABC):
             self._foodCopied = True
 
         self._food[x][y] = False
+        self._food.clearCaches()
         self._lastFoodEaten = (x, y)
 
+        self._zobristItems ^= _zobristKey('food', (x, y))
+
         self._hash = None
         return True
 
@@ -117,22 +158,33 @@ class AbstractGameState(abc.ABC):
         (like if it just died and is respawning).
         """
 
-        position = self._agentStates[index].getPosition()
-        if (position is None):
-            return None
-
-        # Ensure positions are ints.
-        return tuple(int(pos) for pos in position)
+        # Positions are cast to ints (and cached) by the agent state.
+        return self._agentStates[index].getIntPosition()
 
     def getAgentState(self, index):
         return self._agentStates[index]
 
+    def getMutableAgentState(self, index):
+        """
+        Get the agent state with the given index for the purpose of modifying it.
+
+        States created by generateSuccessor() share their agent states with their parent,
+        so the first write to an agent must copy it (just like eatFood()/eatCapsule()).
+        Anything that mutates an agent state must fetch it through this method.
+        """
+
+        if (not self._agentsCopied[index]):
+            self._agentStates[index] = self._agentStates[index].copy()
+            self._agentsCopied[index] = True
+
+        return self._agentStates[index]
+
     def getAgentStates(self):
         return self._agentStates
 
     def getCapsules(self):
         """
-        Returns a list of positions (x, y) of the remaining capsules.
+        Returns the positions (x, y) of the remaining capsules as a frozenset.
         """
 
         return self._capsules
@@ -149,6 +201,25 @@ class AbstractGameState(abc.ABC):
 
         return self._food.copy()
 
+    def getFoodList(self):
+        """
+        Returns a list of positions (x, y) of the remaining food.
+        The list is cached (see `pacai.core.grid.Grid.asList`),
+        so the caller should not modify it.
+        Callers that just need the food locations should favor this over getFood(),
+        which copies the entire grid.
+        """
+
+        return self._food.asList()
+
+    def getFoodCoordinates(self):
+        """
+        Returns the positions of the remaining food as two parallel lists (xs, ys).
+        Like getFoodList(), the lists are cached and should not be modified.
+        """
+
+        return self._food.asCoordinateLists()
+
     def getHighlightLocations(self):
         return self._highlightLocations
 
@@ -249,15 +320,21 @@ class AbstractGameState(abc.ABC):
         """
 
         # Start with a shallow copy.
-        successor = copy.copy(self)
+        # Built by hand (rather than copy.copy()) to skip the copy module's
+        # per-call protocol dispatch; search agents create successors in bulk,
+        # and this construction is their main allocation site.
+        successor = self.__class__.__new__(self.__class__)
+        successor.__dict__.update(self.__dict__)
         successor._hash = None
 
-        # Leave food and capsules as a shallow copy, but mark them to be copied on write.
+        # Leave food as a shallow copy, but mark it to be copied on write.
+        # (Capsules are immutable sets, so they can always be shared as-is.)
         successor._foodCopied = False
-        successor._capsulesCopied = False
 
-        # Agent states need to be deep copied.
-        successor._agentStates = [agentState.copy() for agentState in self._agentStates]
+        # Agent states are also copied on write (via getMutableAgentState()),
+        # since a successor usually only modifies the single agent that moved.
+        successor._agentStates = list(self._agentStates)
+        successor._agentsCopied = [False] * len(self._agentStates)
 
         return successor
 
@@ -275,6 +352,12 @@ class AbstractGameState(abc.ABC):
         # Note that not all fields are being used because we are checking if two states are equal,
         # not is they got to this confiruation in the same way.
 
+        # If both sides already know their hash, a mismatch settles it immediately.
+        # This keeps hash-collision probes (like transposition-table lookups) cheap.
+        if (self._hash is not None and other._hash is not None
+                and self._hash != other._hash):
+            return False
+
         # Check simple fields first.
         if (self._score != other._score
                 or self._gameover != other._gameover
@@ -282,14 +365,25 @@ class AbstractGameState(abc.ABC):
             return False
 
         # Now check the complex fields in increasing order of complexity.
-        return (self._capsules == other._capsules
-                and self._food == other._food
+        # The layout is shared between successors, so identity is the right check.
+        return (len(self._capsules) == len(other._capsules)
                 and self._agentStates == other._agentStates
-                and self._layout == other._layout)
+                and self._capsules == other._capsules
+                and self._food == other._food
+                and self._layout is other._layout)
 
     def __hash__(self):
         if (self._hash is None):
-            self._hash = util.buildHash(self._score, self._gameover, self._win, *self._capsules,
-                self._food, *self._agentStates, self._layout)
+            # The expensive collections (food and capsules) are already folded
+            # into the incrementally-maintained Zobrist component,
+            # so only the agents and the cheap scalar fields need hashing here.
+            agentKeys = 0
+            for (agentIndex, agentState) in enumerate(self._agentStates):
+                agentKeys ^= _zobristKey('agent', agentIndex, agentState.getPosition(),
+                        agentState.getDirection(), agentState.isPacman(),
+                        agentState.getScaredTimer())
+
+            self._hash = int(self._zobristItems ^ agentKeys ^ self._layoutHash
+                    ^ util.buildHash(self._score, self._gameover, self._win))
 
         return self._hash
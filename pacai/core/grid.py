@@ -13,7 +13,24 @@ class Grid:
         self._height = height
         self._data = [[initialValue for y in range(height)] for x in range(width)]
 
+        # Caches, since grids are read far more often than they are mutated.
+        # _listCache holds the asList() result,
+        # and _bitsCache packs the grid into a single int (one bit per cell)
+        # so that count/equality/hash are a few native integer ops instead of cell walks.
+        # Anything mutating the grid's cells must call clearCaches().
+        self._listCache = None
+        self._coordsCache = None
+        self._bitsCache = None
+
     def asList(self, key = True):
+        """
+        Get a list of the positions matching the given key.
+        The default key's list is cached, so the caller should not modify it.
+        """
+
+        if (key is True and self._listCache is not None):
+            return self._listCache
+
         values = []
 
         for x in range(self._width):
@@ -21,14 +38,72 @@ class Grid:
                 if self[x][y] == key:
                     values.append((x, y))
 
+        if (key is True):
+            self._listCache = values
+
         return values
 
+    def asCoordinateLists(self):
+        """
+        Get the positions of the true cells as two parallel lists (xs, ys).
+        This is a structure-of-arrays companion to asList() that lets callers
+        run per-axis lookups with map() instead of unpacking a tuple per cell.
+        The lists are cached, so the caller should not modify them.
+        """
+
+        if (self._coordsCache is None):
+            positions = self.asList()
+            self._coordsCache = ([position[0] for position in positions],
+                    [position[1] for position in positions])
+
+        return self._coordsCache
+
+    def clearCaches(self):
+        """
+        Drop any cached derived data (like the asList() cache).
+        Must be called after directly mutating the grid's cells.
+        """
+
+        self._listCache = None
+        self._coordsCache = None
+        self._bitsCache = None
+
+    def _asBits(self):
+        """
+        Get the grid packed into a single int, with one bit per true cell.
+        Cached, so repeated counts/comparisons/hashes cost O(1) between mutations.
+        """
+
+        if (self._bitsCache is None):
+            bits = 0
+            base = 1
+
+            for row in self._data:
+                for value in row:
+                    if (value):
+                        bits += base
+                    base *= 2
+
+            self._bitsCache = bits
+
+        return self._bitsCache
+
     def copy(self):
         grid = Grid(self._width, self._height)
         grid._data = [row.copy() for row in self._data]
+
+        # The copy holds the same cells, so it can share the caches.
+        # Caches are never mutated in place, only replaced, so sharing is safe.
+        grid._listCache = self._listCache
+        grid._coordsCache = self._coordsCache
+        grid._bitsCache = self._bitsCache
+
         return grid
 
-    def count(self, item =True):
+    def count(self, item = True):
+        if (item is True):
+            return self._asBits().bit_count()
+
         return sum([x.count(item) for x in self._data])
 
     def deepCopy(self):
@@ -55,22 +130,15 @@ class Grid:
         if (other is None):
             return False
 
-        return self._data == other._data
+        return (self._width == other._width
+                and self._height == other._height
+                and self._asBits() == other._asBits())
 
     def __getitem__(self, i):
         return self._data[i]
 
     def __hash__(self):
-        hashcode = 0
-        base = 1
-
-        for row in self._data:
-            for value in row:
-                if (value):
-                    hashcode += base
-                base *= 2
-
-        return hash(hashcode)
+        return hash(self._asBits())
 
     def __lt__(self, other):
         return self.__hash__() < other.__hash__()
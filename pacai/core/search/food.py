@@ -40,7 +40,12 @@ class FoodSearchProblem(SearchProblem):
             nextx, nexty = int(x + dx), int(y + dy)
             if not self.walls[nextx][nexty]:
                 nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
+                if nextFood[nextx][nexty]:
+                    # Writing through the column list bypasses the grid API,
+                    # so the copied grid's caches must be dropped by hand.
+                    nextFood[nextx][nexty] = False
+                    nextFood.clearCaches()
+
                 successors.append((((nextx, nexty), nextFood), direction, 1))
 
         return successors
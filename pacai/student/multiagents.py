@@ -1,8 +1,42 @@
 import random
 
+from operator import add
+
 from pacai.agents.base import BaseAgent
 from pacai.agents.search.multiagent import MultiAgentSearchAgent
 from pacai.core import distance
+from pacai.core.directions import Directions
+
+# Flags for transposition table entries in AlphaBetaAgent.
+# A cached value is either the exact minimax value of the node,
+# or a bound on it (when the node was cut off by alpha/beta).
+TT_EXACT = 0
+TT_LOWER_BOUND = 1
+TT_UPPER_BOUND = 2
+
+def _minTableDistance(dxTable, dyTable, xs, ys):
+    """
+    The minimum of dxTable[x] + dyTable[y] over two parallel coordinate lists,
+    computed as a single streamed map() pass with no intermediate lists.
+    """
+
+    return min(map(add, map(dxTable.__getitem__, xs), map(dyTable.__getitem__, ys)))
+
+def _pacmanActions(gameState):
+    """
+    Get pacman's legal actions with STOP filtered out,
+    since stopping is never worth expanding a whole search subtree for.
+    (Ghosts never have STOP as a legal action, so they need no filtering.)
+    """
+
+    actions = [action for action in gameState.getLegalActions(0)
+            if action != Directions.STOP]
+
+    if (not actions):
+        # STOP was somehow the only legal action.
+        actions = [Directions.STOP]
+
+    return actions
 
 class ReflexAgent(BaseAgent):
     """
@@ -55,19 +89,20 @@ class ReflexAgent(BaseAgent):
 
         # Useful information you can extract.
         newPosition = successorGameState.getPacmanPosition()
-        oldFoodList = currentGameState.getFood().asList()
-        newFoodList = successorGameState.getFood().asList()
+        oldFoodList = currentGameState.getFoodList()
+        newFoodList = successorGameState.getFoodList()
 
         newGhostStates = successorGameState.getGhostStates()
 
         # Find the distance to the closest ghost
+        closest = float('inf')
         for state in newGhostStates:
-            closest = float('inf')
             dist = distance.manhattan(state.getPosition(), newPosition)
             # If the state is losing, return a very low score
             if dist <= 1 and state.getScaredTimer() <= 1:
                 return -999999
-            closest = min(closest, dist)
+            if dist < closest:
+                closest = dist
 
         # Factor in the distance to the closest ghost
         if closest != 0 and closest != float('inf'):
@@ -77,8 +112,18 @@ class ReflexAgent(BaseAgent):
         if len(newFoodList) == 0 or len(newFoodList) < len(oldFoodList):
             return 999999
 
-        # Factor in the distance to the closest food
-        eval += (1 / min(distance.manhattan(newPosition, food) for food in newFoodList))
+        # Precompute per-axis distance tables from pacman's position once,
+        # so each food lookup below is two list indexes instead of a manhattan() call.
+        walls = successorGameState.getWalls()
+        px, py = newPosition
+        dxTable = [abs(x - px) for x in range(walls.getWidth())]
+        dyTable = [abs(y - py) for y in range(walls.getHeight())]
+
+        # Factor in the distance to the closest food.
+        # The coordinates come as two parallel lists,
+        # so the whole reduction runs through map() without unpacking a tuple per food.
+        foodXs, foodYs = successorGameState.getFoodCoordinates()
+        eval += (1 / _minTableDistance(dxTable, dyTable, foodXs, foodYs))
 
         return eval
 
@@ -113,6 +158,15 @@ class MinimaxAgent(MultiAgentSearchAgent):
         super().__init__(index, **kwargs)
 
     def getAction(self, gameState):
+        # Transposition table, cleared each turn.
+        # Different move orderings reach identical states,
+        # so caching values by (state, agent, depth) avoids re-searching whole subtrees.
+        self._tt = {}
+
+        # Hoist per-turn constants out of the recursion;
+        # these lookups otherwise repeat at every node.
+        self._evalFn = self.getEvaluationFunction()
+
         return self.minimax(gameState)
 
     def minimax(self, gameState):
@@ -129,16 +183,30 @@ class MinimaxAgent(MultiAgentSearchAgent):
         v = float('-inf')
 
         if self.terminalNode(gameState, treeDepth):
-            return self.getEvaluationFunction()(gameState)
+            return self._evalFn(gameState)
+
+        # The root returns an action (not a value), so only cache below the root.
+        atRoot = (treeDepth == self.getTreeDepth())
+        key = (hash(gameState), 0, treeDepth)
+        if not atRoot and key in self._tt:
+            return self._tt[key]
+
+        # Bind the bound method once; the loop body otherwise
+        # re-resolves the attribute for every expanded action.
+        generateSuccessor = gameState.generateSuccessor
 
         bestAction = None
-        for action in gameState.getLegalActions(0):
-            newV = self.minValue(gameState.generateSuccessor(0, action), treeDepth)
+        for action in _pacmanActions(gameState):
+            newV = self.minValue(generateSuccessor(0, action), treeDepth)
             if newV > v:
                 v = newV
                 bestAction = action
 
-        return bestAction if treeDepth == self.getTreeDepth() else v
+        if atRoot:
+            return bestAction
+
+        self._tt[key] = v
+        return v
 
     def minValue(self, gameState, treeDepth, agentIndex = 1):
         """
@@ -148,21 +216,31 @@ class MinimaxAgent(MultiAgentSearchAgent):
         v = float('inf')
 
         if self.terminalNode(gameState, treeDepth):
-            return self.getEvaluationFunction()(gameState)
+            return self._evalFn(gameState)
+
+        key = (hash(gameState), agentIndex, treeDepth)
+        if key in self._tt:
+            return self._tt[key]
 
         # If current agent is the last, switch to max agent
         if agentIndex == gameState.getNumAgents() - 1:
-            return self.maxValue(gameState, treeDepth - 1)
-        for action in gameState.getLegalActions(agentIndex):
-            v = min(v, self.minValue(gameState.generateSuccessor(agentIndex, action),
-                                     treeDepth, agentIndex + 1))
+            v = self.maxValue(gameState, treeDepth - 1)
+        else:
+            generateSuccessor = gameState.generateSuccessor
+            for action in gameState.getLegalActions(agentIndex):
+                v = min(v, self.minValue(generateSuccessor(agentIndex, action),
+                                         treeDepth, agentIndex + 1))
+
+        self._tt[key] = v
         return v
 
     def terminalNode(self, gameState, treeDepth):
         """
         Checks whether a given state is a terminal node
         """
-        return gameState.isWin() or gameState.isLose() or treeDepth == 0
+        # isOver() covers both isWin() and isLose() with a single call,
+        # and this check runs at the top of every node in the search.
+        return treeDepth == 0 or gameState.isOver()
 
 class AlphaBetaAgent(MultiAgentSearchAgent):
     """
@@ -180,17 +258,47 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         super().__init__(index, **kwargs)
 
     def getAction(self, gameState):
+        # Transposition table, cleared each turn.
+        # Entries hold (value, flag), where the flag records whether the value is
+        # exact or just a bound (the node was cut off before being fully searched).
+        self._tt = {}
+
+        # Hoist per-turn constants out of the recursion;
+        # these lookups otherwise repeat at every node.
+        self._evalFn = self.getEvaluationFunction()
+
+        # Move-ordering helpers, also cleared each turn.
+        # _ordering remembers the last value seen for each (state, agent) node,
+        # and _killer remembers the last move that caused a cutoff at each ply,
+        # so deeper iterations can try the most promising moves first.
+        self._ordering = {}
+        self._killer = {}
+
         return self.alphaBeta(gameState)
 
     def alphaBeta(self, gameState):
         """
         Uses minimax algorithm with alpha-beta pruning to return the
-        best possible action for the first agent within a given tree depth
+        best possible action for the first agent within a given tree depth.
+
+        The search is run with iterative deepening: depth 1, 2, ..., treeDepth.
+        The shallower iterations fill the ordering and killer-move tables,
+        so later iterations try the best known moves first and prune much harder.
         """
         treeDepth = self.getTreeDepth()
 
         if self.terminalNode(gameState, treeDepth):
-            return self.getEvaluationFunction()(gameState)
+            return self._evalFn(gameState)
+
+        bestAction = None
+        for depth in range(1, treeDepth + 1):
+            bestAction = self.searchRoot(gameState, depth)
+        return bestAction
+
+    def searchRoot(self, gameState, treeDepth):
+        """
+        Run one full-depth alpha-beta pass from the root and return the best action.
+        """
 
         # Initializes v, alpha, and beta
         v = float('-inf')
@@ -198,51 +306,134 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         beta = float('inf')
 
         bestAction = None
-        for action in gameState.getLegalActions(0):
-            newV = self.minValue(gameState.generateSuccessor(0, action),
-                                 treeDepth, alpha, beta)
+        for action, successor in self.orderedSuccessors(gameState, 0, treeDepth, True):
+            newV = self.minValue(successor, treeDepth, alpha, beta)
             if newV > v:
                 v = newV
                 bestAction = action
             alpha = max(alpha, v)
         return bestAction
 
+    def orderedSuccessors(self, gameState, agentIndex, treeDepth, maximizing):
+        """
+        Generate (action, successor) pairs for the agent,
+        ordered so the most promising moves come first:
+        the killer move for this ply, then moves sorted by the value their successor
+        received in an earlier iteration, then unexplored moves.
+        """
+
+        killer = self._killer.get((agentIndex, treeDepth))
+        childIndex = (agentIndex + 1) % gameState.getNumAgents()
+        sign = -1 if maximizing else 1
+
+        if agentIndex == 0:
+            actions = _pacmanActions(gameState)
+        else:
+            actions = gameState.getLegalActions(agentIndex)
+
+        generateSuccessor = gameState.generateSuccessor
+        pairs = [(action, generateSuccessor(agentIndex, action))
+                for action in actions]
+
+        def sortKey(pair):
+            action, successor = pair
+            if action == killer:
+                return (0, 0)
+
+            value = self._ordering.get((hash(successor), childIndex))
+            if value is None:
+                return (2, 0)
+
+            return (1, sign * value)
+
+        pairs.sort(key = sortKey)
+        return pairs
+
     def maxValue(self, gameState, treeDepth, alpha, beta):
         v = float('-inf')
 
         if self.terminalNode(gameState, treeDepth):
-            return self.getEvaluationFunction()(gameState)
+            return self._evalFn(gameState)
 
-        for action in gameState.getLegalActions(0):
-            v = max(v, self.minValue(gameState.generateSuccessor(0, action),
-                                     treeDepth, alpha, beta))
+        key = (hash(gameState), 0, treeDepth)
+        cached = self._ttLookup(key, alpha, beta)
+        if cached is not None:
+            return cached
+
+        for action, successor in self.orderedSuccessors(gameState, 0, treeDepth, True):
+            v = max(v, self.minValue(successor, treeDepth, alpha, beta))
             # If v is greater or equal to our beta, we can prune the rest of the subtree
             if v >= beta:
+                self._killer[(0, treeDepth)] = action
+                self._ttStore(key, v, TT_LOWER_BOUND)
                 return v
             # Update alpha
             alpha = max(alpha, v)
+
+        self._ttStore(key, v, TT_EXACT)
         return v
 
     def minValue(self, gameState, treeDepth, alpha, beta, agentIndex = 1):
         v = float('inf')
 
         if self.terminalNode(gameState, treeDepth):
-            return self.getEvaluationFunction()(gameState)
+            return self._evalFn(gameState)
+
+        key = (hash(gameState), agentIndex, treeDepth)
+        cached = self._ttLookup(key, alpha, beta)
+        if cached is not None:
+            return cached
 
         if agentIndex == gameState.getNumAgents() - 1:
-            return self.maxValue(gameState, treeDepth - 1, alpha, beta)
-        for action in gameState.getLegalActions(agentIndex):
-            v = min(v, self.minValue(gameState.generateSuccessor(agentIndex, action),
-                                     treeDepth, alpha, beta, agentIndex + 1))
+            v = self.maxValue(gameState, treeDepth - 1, alpha, beta)
+            self._ttStore(key, v, TT_EXACT)
+            return v
+        for action, successor in self.orderedSuccessors(gameState, agentIndex,
+                treeDepth, False):
+            v = min(v, self.minValue(successor, treeDepth, alpha, beta, agentIndex + 1))
             # If v is less than or equal to our alpha, we can prune the rest of the subtree
             if v <= alpha:
+                self._killer[(agentIndex, treeDepth)] = action
+                self._ttStore(key, v, TT_UPPER_BOUND)
                 return v
             # Update beta
             beta = min(beta, v)
+
+        self._ttStore(key, v, TT_EXACT)
         return v
 
+    def _ttStore(self, key, value, flag):
+        """
+        Cache a node's value and remember it for move ordering in later iterations.
+        """
+
+        self._tt[key] = (value, flag)
+        self._ordering[(key[0], key[1])] = value
+
+    def _ttLookup(self, key, alpha, beta):
+        """
+        Return a usable cached value for this node, or None.
+        Exact values can always be reused,
+        while bounds only count when they already prune against the current window.
+        """
+
+        entry = self._tt.get(key)
+        if entry is None:
+            return None
+
+        value, flag = entry
+        if flag == TT_EXACT:
+            return value
+        if flag == TT_LOWER_BOUND and value >= beta:
+            return value
+        if flag == TT_UPPER_BOUND and value <= alpha:
+            return value
+
+        return None
+
     def terminalNode(self, gameState, treeDepth):
-        return gameState.isWin() or gameState.isLose() or treeDepth == 0
+        # See MinimaxAgent.terminalNode.
+        return treeDepth == 0 or gameState.isOver()
 
 class ExpectimaxAgent(MultiAgentSearchAgent):
     """
@@ -262,6 +453,15 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         super().__init__(index, **kwargs)
 
     def getAction(self, gameState):
+        # Transposition table, cleared each turn.
+        # Expectimax values are exact, so any revisited (state, agent, depth) node
+        # can reuse its cached value directly.
+        self._tt = {}
+
+        # Hoist per-turn constants out of the recursion;
+        # these lookups otherwise repeat at every node.
+        self._evalFn = self.getEvaluationFunction()
+
         return self.value(gameState, self.getTreeDepth())
 
     def value(self, gameState, treeDepth, agentIndex=0):
@@ -269,22 +469,38 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         Returns the value of the best action given an agent's possible actions
         """
         if self.terminalNode(gameState, treeDepth):
-            return self.getEvaluationFunction()(gameState)
+            return self._evalFn(gameState)
+
+        # The root returns an action (not a value), so only cache below the root.
+        atRoot = (treeDepth == self.getTreeDepth() and agentIndex == 0)
+        key = (hash(gameState), agentIndex, treeDepth)
+        if not atRoot and key in self._tt:
+            return self._tt[key]
+
         if agentIndex == 0:
             action, val = self.maxValue(gameState, treeDepth, agentIndex)
-            return action if treeDepth == self.getTreeDepth() else val
+            if atRoot:
+                return action
+            result = val
         else:
-            return self.expValue(gameState, treeDepth, agentIndex)
+            result = self.expValue(gameState, treeDepth, agentIndex)
+
+        self._tt[key] = result
+        return result
 
     def maxValue(self, gameState, treeDepth, agentIndex):
         v = float('-inf')
         bestAction = None
-        # Decrements the tree depth if the current agent is the last agent
-        if agentIndex == gameState.getNumAgents() - 1:
-            treeDepth -= 1
-        for action in gameState.getLegalActions(agentIndex):
-            newV = self.value(gameState.generateSuccessor(agentIndex, action),
-                              treeDepth, (agentIndex + 1) % gameState.getNumAgents())
+
+        # One ply is consumed when the turn passes back to pacman.
+        # Compute the transition once instead of per action.
+        nextAgent = (agentIndex + 1) % gameState.getNumAgents()
+        nextDepth = treeDepth - 1 if nextAgent == 0 else treeDepth
+
+        generateSuccessor = gameState.generateSuccessor
+        for action in _pacmanActions(gameState):
+            newV = self.value(generateSuccessor(agentIndex, action),
+                              nextDepth, nextAgent)
             if newV > v:
                 v = newV
                 bestAction = action
@@ -292,16 +508,23 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
 
     def expValue(self, gameState, treeDepth, agentIndex):
         v = 0
-        # Decrements the tree depth if the current agent is the last agent
-        if agentIndex == gameState.getNumAgents() - 1:
-            treeDepth -= 1
-        for action in gameState.getLegalActions(agentIndex):
-            v += self.value(gameState.generateSuccessor(agentIndex, action),
-                            treeDepth, (agentIndex + 1) % gameState.getNumAgents())
-        return v / len(gameState.getLegalActions(agentIndex))
+
+        # One ply is consumed when the turn passes back to pacman.
+        # Compute the transition once instead of per action.
+        nextAgent = (agentIndex + 1) % gameState.getNumAgents()
+        nextDepth = treeDepth - 1 if nextAgent == 0 else treeDepth
+
+        # Fetch the legal actions once; they are needed for both the loop and the average.
+        actions = gameState.getLegalActions(agentIndex)
+        generateSuccessor = gameState.generateSuccessor
+        for action in actions:
+            v += self.value(generateSuccessor(agentIndex, action),
+                            nextDepth, nextAgent)
+        return v / len(actions)
 
     def terminalNode(self, gameState, treeDepth):
-        return gameState.isWin() or gameState.isLose() or treeDepth == 0
+        # See MinimaxAgent.terminalNode.
+        return treeDepth == 0 or gameState.isOver()
 
 def betterEvaluationFunction(currentGameState):
     """
@@ -311,24 +534,48 @@ def betterEvaluationFunction(currentGameState):
     and applies different weights to prioritize Pacman's actions.
     """
 
-    # Useful information you can extract.
-    foodList = currentGameState.getFood().asList()
+    # Marshal the state into plain scalars, tuples, and lists once,
+    # so the numeric kernel below never touches the game state.
+    walls = currentGameState.getWalls()
+    foodXs, foodYs = currentGameState.getFoodCoordinates()
     currentPosition = currentGameState.getPacmanPosition()
-    ghostStates = currentGameState.getGhostStates()
+    ghosts = [(state.getPosition(), state.getScaredTimer())
+            for state in currentGameState.getGhostStates()]
     capsules = currentGameState.getCapsules()
 
+    return _evaluationKernel(currentPosition, ghosts, foodXs, foodYs, capsules,
+            currentGameState.getScore(), walls.getWidth(), walls.getHeight())
+
+def _evaluationKernel(position, ghosts, foodXs, foodYs, capsules, score, width, height):
+    """
+    The numeric core of `betterEvaluationFunction`.
+
+    This operates only on plain scalars, tuples, and lists,
+    keeping the per-leaf arithmetic free of game-state lookups and method calls.
+    """
+
     # Weights to tweak the behavior of Pacman
     foodWeight = 1.0
     ghostWeight = 10.0
     capsuleWeight = 1.5
     scaredWeight = 1.0
 
-    eval = currentGameState.getScore()
-
-    # Factor in the distance to the ghosts and their scared times
-    for state in ghostStates:
-        dist = distance.manhattan(state.getPosition(), currentPosition)
-        scaredTime = state.getScaredTimer()
+    eval = score
+
+    # Precompute per-axis distance tables from pacman's position once.
+    # Food and capsules sit on integer cells, so their manhattan distances
+    # become two list indexes each.
+    # Ghosts can sit between cells, so they keep the direct computation.
+    px, py = position
+    dxTable = [abs(x - px) for x in range(width)]
+    dyTable = [abs(y - py) for y in range(height)]
+
+    # Factor in the distance to the ghosts and their scared times.
+    # A single pass over the ghosts also tracks the smallest scared timer,
+    # instead of walking the ghost list a second time for it.
+    minScaredTime = float('inf')
+    for ((ghostX, ghostY), scaredTime) in ghosts:
+        dist = abs(ghostX - px) + abs(ghostY - py)
         if dist > 2:
             if scaredTime > dist:
                 eval += ghostWeight * (1 / dist)
@@ -337,20 +584,33 @@ def betterEvaluationFunction(currentGameState):
         else:
             return -999999
 
-    # Factor in the ghost with the smallest scared time
-    eval += scaredWeight * min(ghost.getScaredTimer() for ghost in ghostStates)
+        if scaredTime < minScaredTime:
+            minScaredTime = scaredTime
 
-    # Factor in the distance to the closest fooda
-    if len(foodList) > 0:
-        minFoodDist = min(distance.manhattan(currentPosition, food) for food in foodList)
-        eval += foodWeight * (1 / minFoodDist)
+    # Factor in the ghost with the smallest scared time
+    if ghosts:
+        eval += scaredWeight * minScaredTime
+
+    # Factor in the distance to the closest food.
+    # Distance zero (standing on an uneaten item) would divide by zero below,
+    # so it is scored as strictly better than being one step away.
+    if len(foodXs) > 0:
+        minFoodDist = _minTableDistance(dxTable, dyTable, foodXs, foodYs)
+        if minFoodDist > 0:
+            eval += foodWeight * (1 / minFoodDist)
+        else:
+            eval += foodWeight * 2
     else:
         return 999999
 
-        # Factor in the distance to the capsules
+    # Factor in the distance to the capsules (guarded like the food above).
     if len(capsules) > 0:
-        minCapsuleDist = min(distance.manhattan(currentPosition, capsule) for capsule in capsules)
-        eval += capsuleWeight * (1 / minCapsuleDist)
+        capsuleXs, capsuleYs = zip(*capsules)
+        minCapsuleDist = _minTableDistance(dxTable, dyTable, capsuleXs, capsuleYs)
+        if minCapsuleDist > 0:
+            eval += capsuleWeight * (1 / minCapsuleDist)
+        else:
+            eval += capsuleWeight * 2
 
     return eval
 
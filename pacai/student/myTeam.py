@@ -1,7 +1,44 @@
-# from pacai.agents.capture.capture import CaptureAgent
+import time
+
 from pacai.agents.capture.reflex import ReflexCaptureAgent
 from pacai.core.directions import Directions
 
+# Hoisted once: the reverse-direction table never changes, and the per-leaf
+# feature code otherwise re-resolves the class attribute on every lookup.
+_REVERSE = Directions.REVERSE
+
+# Flags for transposition-table entries.
+# A cached value is either the exact minimax value of the node,
+# or a bound on it (when the node was cut off by alpha/beta).
+TT_EXACT = 0
+TT_LOWER_BOUND = 1
+TT_UPPER_BOUND = 2
+
+# Feature weights, hoisted to module level so getWeights hands out the same
+# dict instead of rebuilding an 11-entry literal per call.
+_OFFENSIVE_WEIGHTS = {
+    "successorScore": 200,
+    "invaderValue": -50,
+    "numInvaders": -1000,
+    "distanceToFood": -10,
+    "remainingFood": -1,
+    "distanceToCapsules": -2,
+    "stop": -100,
+    "reverse": -20,
+    "normalValue": 2,
+    "scaredValue": 100000,
+    "densityFood": 300,
+}
+
+_DEFENSIVE_WEIGHTS = {
+    "numInvaders": -1000,
+    "onDefense": 100,
+    "invaderDistance": -200,
+    "stop": -100,
+    "reverse": -10,
+    "edge": -10,
+}
+
 
 def createTeam(
     firstIndex,
@@ -20,7 +57,359 @@ def createTeam(
     return [OffensiveAgent(firstIndex), DefensiveAgent(secondIndex)]
 
 
-class OffensiveAgent(ReflexCaptureAgent):
+class _SearchTimeout(Exception):
+    """
+    Raised inside the minimax search when the per-move time budget runs out,
+    so the agent can fall back to the last fully-searched depth.
+    """
+
+    pass
+
+
+class _LazyDistances:
+    """
+    Dict-like fallback for positions the precomputed distance table cannot
+    serve (e.g. mid-cell positions): each lookup computes one distance.
+    """
+
+    def __init__(self, distancer, pos):
+        self._distancer = distancer
+        self._pos = pos
+
+    def __getitem__(self, target):
+        return self._distancer.getDistance(self._pos, target)
+
+
+class MiniMaxReflexCaptureAgent(ReflexCaptureAgent):
+    """
+    A reflex capture agent that chooses its action with a minimax search over
+    all four agents instead of a one-ply lookahead. Our agents are maximizers,
+    the opponents are minimizers, and leaves are scored with the same
+    evaluate() the reflex lookahead uses.
+
+    The search is alpha-beta pruned: branches that cannot change the decision
+    at the root are cut off, which typically reduces the expanded nodes from
+    O(b^d) to about O(b^(d/2)) and frees most of the per-turn time budget.
+    """
+
+    def __init__(self, index, **kwargs):
+        super().__init__(index, **kwargs)
+
+        self._rootDepth = 1
+        self._deadline = 0.0
+
+    def registerInitialState(self, gameState):
+        super().registerInitialState(gameState)
+
+        # Static for the whole game: the opponent indices never change,
+        # so don't re-derive them for every evaluated leaf.
+        self.opponents = tuple(self.getOpponents(gameState))
+
+        # The last agent in the search cycle; computing this per node adds up.
+        self.lastAgent = (self.index + 3) % 4
+
+        # The weight vectors are constant dict literals,
+        # so build them once instead of once per evaluated leaf.
+        self.weights = self.getWeights(gameState, Directions.STOP)
+
+    # The deepest ply count iterative deepening will attempt.
+    MAX_DEPTH = 3
+
+    def chooseAction(self, gameState):
+        # Transposition table, cleared each turn to bound memory.
+        # Different move orderings reach identical states, so caching values
+        # by (state, agent, depth) avoids re-searching whole subtrees.
+        # Entries hold (value, flag), where the flag records whether the value
+        # is exact or just a bound from an alpha-beta cutoff.
+        self._tt = {}
+
+        # Move-ordering table, also cleared each turn: the best move recorded
+        # for each (state, agent) node, so a later (deeper) visit tries it
+        # first and tightens the alpha-beta window sooner.
+        self._bestMove = {}
+
+        # Successor pool, also cleared each turn. States are immutable to the
+        # search, so when iterative deepening revisits a node the children
+        # generated by a shallower pass can be handed back as-is instead of
+        # being cloned again.
+        self._succCache = {}
+
+        # Leaf-evaluation cache, also cleared each turn. Transpositions and
+        # iterative deepening revisit the same leaf states, and the feature
+        # extraction behind evaluate() is the most expensive part of a visit.
+        self._evalCache = {}
+
+        # Density-map cache, also cleared each turn. The density map depends
+        # only on the food layout, which most same-turn states share.
+        self._densityCache = {}
+
+        return self.minimax(gameState)
+
+    def minimax(self, gameState):
+        """
+        Uses minimax algorithm to return the best possible action for this agent.
+
+        The search is iteratively deepened: the depth-1 answer is always
+        computed, and deeper searches run while the per-move time budget
+        allows. Each completed depth warms the transposition and ordering
+        tables, so the next one prunes much harder, and a depth that runs out
+        of time is abandoned in favor of the last fully-searched answer.
+        """
+
+        self._deadline = time.perf_counter() + 0.8 * self.timeForComputing
+
+        bestAction = None
+        for depth in range(1, self.MAX_DEPTH + 1):
+            self._rootDepth = depth
+            try:
+                bestAction = self.maxValue(
+                    gameState, depth, self.index, float("-inf"), float("inf")
+                )
+            except _SearchTimeout:
+                break
+
+            if time.perf_counter() > self._deadline:
+                break
+
+        return bestAction
+
+    def maxValue(self, gameState, treeDepth, agentIndex, alpha, beta):
+        """
+        Finds the maximum value of the current state's possible actions.
+        """
+
+        v = float("-inf")
+
+        if self.terminalNode(gameState, treeDepth):
+            return self.evaluate(gameState, Directions.STOP)
+
+        if self._rootDepth > 1 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        # If the current agent is the last in the cycle, the next ply begins.
+        if agentIndex == self.lastAgent:
+            treeDepth -= 1
+
+        atRoot = treeDepth == self._rootDepth and agentIndex == self.index
+
+        # The root returns an action (not a value), so only cache below it.
+        key = (hash(gameState), agentIndex, treeDepth)
+        if not atRoot:
+            cached = self._ttLookup(key, alpha, beta)
+            if cached is not None:
+                return cached
+
+        alphaOrig = alpha
+
+        actions = gameState.getLegalActions(agentIndex)
+        if atRoot:
+            # STOP is weighted so harshly that it never wins the argmax,
+            # yet it would cost a full subtree to search.
+            nonStop = [action for action in actions if action != Directions.STOP]
+            if nonStop:
+                actions = nonStop
+
+        nextAgent = (agentIndex + 1) % 4
+
+        bestAction = None
+        for action, successor in self.orderedSuccessors(gameState, agentIndex, actions):
+            newV = self.minValue(successor, treeDepth, nextAgent, alpha, beta)
+            if newV > v:
+                v = newV
+                bestAction = action
+
+            # The minimizer above will never allow a value this high,
+            # so the remaining actions cannot matter.
+            if v >= beta:
+                self._ttStore(key, v, TT_LOWER_BOUND, action)
+                return v
+            alpha = max(alpha, v)
+
+        if atRoot:
+            return bestAction
+
+        # A fail-low only proves an upper bound on the true value.
+        flag = TT_UPPER_BOUND if v <= alphaOrig else TT_EXACT
+        self._ttStore(key, v, flag, bestAction)
+        return v
+
+    def minValue(self, gameState, treeDepth, agentIndex, alpha, beta):
+        """
+        Returns the minimum tree value for each minimizing (opponent) agent.
+        """
+
+        v = float("inf")
+
+        if self.terminalNode(gameState, treeDepth):
+            return self.evaluate(gameState, Directions.STOP)
+
+        if self._rootDepth > 1 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        # If the current agent is the last in the cycle, the next ply begins.
+        if agentIndex == self.lastAgent:
+            treeDepth -= 1
+
+        key = (hash(gameState), agentIndex, treeDepth)
+        cached = self._ttLookup(key, alpha, beta)
+        if cached is not None:
+            return cached
+
+        betaOrig = beta
+        nextAgent = (agentIndex + 1) % 4
+
+        bestAction = None
+        for action, successor in self.orderedSuccessors(
+            gameState, agentIndex, gameState.getLegalActions(agentIndex)
+        ):
+            newV = self.maxValue(successor, treeDepth, nextAgent, alpha, beta)
+            if newV < v:
+                v = newV
+                bestAction = action
+
+            # The maximizer above already has a better option than this.
+            if v <= alpha:
+                self._ttStore(key, v, TT_UPPER_BOUND, action)
+                return v
+            beta = min(beta, v)
+
+        # A fail-high only proves a lower bound on the true value.
+        flag = TT_LOWER_BOUND if v >= betaOrig else TT_EXACT
+        self._ttStore(key, v, flag, bestAction)
+        return v
+
+    def _ttLookup(self, key, alpha, beta):
+        """
+        Return a usable cached value for this node, or None.
+        Exact values can always be reused, while bounds only count when they
+        already prune against the current alpha-beta window.
+        """
+
+        entry = self._tt.get(key)
+        if entry is None:
+            return None
+
+        value, flag = entry
+        if flag == TT_EXACT:
+            return value
+        if flag == TT_LOWER_BOUND and value >= beta:
+            return value
+        if flag == TT_UPPER_BOUND and value <= alpha:
+            return value
+
+        return None
+
+    def _ttStore(self, key, value, flag, bestAction=None):
+        """
+        Cache a node's value, and remember the move that produced it (or the
+        cutoff) so deeper iterations can try it first.
+        """
+
+        self._tt[key] = (value, flag)
+        if bestAction is not None:
+            self._bestMove[(key[0], key[1])] = bestAction
+
+    def orderedSuccessors(self, gameState, agentIndex, actions):
+        """
+        Lazily generate (action, successor) pairs for the agent, trying the
+        best move a shallower iteration recorded for this node first. Lazy
+        generation means successors past an alpha-beta cutoff are never
+        allocated at all, and the per-turn successor pool hands back the same
+        child object when a node is revisited instead of cloning it again.
+        """
+
+        parentHash = hash(gameState)
+        best = self._bestMove.get((parentHash, agentIndex))
+
+        if best is not None and best in actions:
+            yield best, self._successor(gameState, parentHash, agentIndex, best)
+
+        for action in actions:
+            if action != best:
+                yield action, self._successor(gameState, parentHash, agentIndex, action)
+
+    def _successor(self, gameState, parentHash, agentIndex, action):
+        """
+        Fetch a successor from the per-turn pool, generating it on a miss.
+        """
+
+        key = (parentHash, agentIndex, action)
+        successor = self._succCache.get(key)
+        if successor is None:
+            successor = gameState.generateSuccessor(agentIndex, action)
+            self._succCache[key] = successor
+
+        return successor
+
+    def terminalNode(self, gameState, treeDepth):
+        """
+        Checks whether a given state is a terminal node.
+        """
+
+        return treeDepth == 0 or gameState.isOver()
+
+    def getSuccessor(self, gameState, action):
+        """
+        Finds the next successor state.
+
+        Minimax leaves are scored with STOP, which moves nothing the features
+        can see - so skip manufacturing (and copying) a whole successor state
+        for it and evaluate the leaf state in place.
+        """
+
+        if action == Directions.STOP:
+            return gameState
+
+        # Non-STOP successors go through the same per-turn pool the search
+        # uses, so a state cloned for the search is never cloned again for
+        # feature extraction (or vice versa).
+        key = (hash(gameState), self.index, action)
+        successor = self._succCache.get(key)
+        if successor is None:
+            successor = super().getSuccessor(gameState, action)
+            self._succCache[key] = successor
+
+        return successor
+
+    def evaluate(self, gameState, action):
+        """
+        Computes a linear combination of features and the cached feature weights.
+        Results are memoized per turn, since transpositions and iterative
+        deepening score the same leaf states repeatedly.
+        """
+
+        key = (hash(gameState), action)
+        value = self._evalCache.get(key)
+        if value is not None:
+            return value
+
+        features = self.getFeatures(gameState, action)
+        weights = self.weights
+
+        # Plain accumulation over items(): one lookup per feature and no
+        # generator frame, the cheapest form of this dot product at dict size.
+        value = 0
+        for feature, featureValue in features.items():
+            value += featureValue * weights[feature]
+
+        self._evalCache[key] = value
+        return value
+
+    def mazeDistancesFrom(self, pos):
+        """
+        Get a dict of maze distances from pos to every position, so a batch of
+        targets costs one dict lookup each instead of a getMazeDistance call
+        (and its tuple-pair hashing) apiece.
+        """
+
+        distances = self.distancer.getDistancesFrom(pos)
+        if distances is None:
+            distances = _LazyDistances(self.distancer, pos)
+
+        return distances
+
+
+class OffensiveAgent(MiniMaxReflexCaptureAgent):
     """
     CREDIT: Part of this code comes from:
         pacai.agents.capture.offense.OffensiveReflexiveAgent
@@ -50,30 +439,119 @@ class OffensiveAgent(ReflexCaptureAgent):
             food zones.
     """
 
+    # How far (in cells) the density window reaches around each food cell.
+    # Earlier revisions of this file disagreed on the value; keeping it as
+    # data means variants are a subclass, not a second copy of the class.
+    DENSITY_RADIUS = 2
+
     def __init__(self, index, **kwargs):
         super().__init__(index, **kwargs)
 
+    def registerInitialState(self, gameState):
+        super().registerInitialState(gameState)
+
+        # Compile the density window for every cell ahead of time: the
+        # clamped bounds arithmetic depends only on the grid shape, which is
+        # static, so the per-food loop can replay ready-made (column, slice)
+        # pairs instead of redoing four min/max computations per cell.
+        walls = gameState.getWalls()
+        width = walls.getWidth()
+        height = walls.getHeight()
+        radius = self.DENSITY_RADIUS
+
+        # Indexed [x][y]: two list subscripts are cheaper than hashing a
+        # position tuple on every probe.
+        self._windows = [
+            [
+                tuple(
+                    (x2, slice(max(1, y - radius), min(height, y + radius)))
+                    for x2 in range(max(1, x - radius), min(width, x + radius))
+                )
+                for y in range(height)
+            ]
+            for x in range(width)
+        ]
+
     def getFeatures(self, gameState, action):
         features = {}
         successor = self.getSuccessor(gameState, action)
         features["successorScore"] = self.getScore(successor)
 
+        myPos = successor.getAgentState(self.index).getPosition()
+
+        # One precomputed distance row serves every target below
+        # with a single dict lookup. Binding its __getitem__ once lets each
+        # block reduce through map() with no per-element attribute resolution.
+        distTo = self.mazeDistancesFrom(myPos).__getitem__
+
+        # Classify the enemies and take every distance minimum in one pass,
+        # instead of building intermediate invader/defender/scared/normal
+        # lists and walking the same two enemies several times. This runs
+        # before the food features because its result can make the density
+        # scan pointless.
+        numInvaders = 0
+        minInvader = minNormal = minScared = None
+
+        getAgentState = successor.getAgentState
+        for i in self.opponents:
+            a = getAgentState(i)
+            pos = a.getPosition()
+            if pos is None:
+                continue
+
+            dist = distTo(pos)
+            if a.isPacman():
+                numInvaders += 1
+                if minInvader is None or dist < minInvader:
+                    minInvader = dist
+            elif a.getScaredTimer() != 0:
+                if minScared is None or dist < minScared:
+                    minScared = dist
+            elif minNormal is None or dist < minNormal:
+                minNormal = dist
+
+        # Calculate feature for normal (not scared) enemy defending agents
+        if minNormal is not None:
+            features["normalValue"] = -100000 if minNormal <= 1 else minNormal
+
+        # A scared defender we are standing on is about to be eaten
+        if minScared == 0:
+            features["scaredValue"] = 1
+
+        # Calculate the invaderValue
+        if minInvader is not None:
+            features["invaderValue"] = minInvader
+
+        # Include numInvaders so it would kill enemy pacman when they're invading
+        features["numInvaders"] = numInvaders
+
+
         # Compute distance to the nearest food.
-        foodList = self.getFood(successor).asList()
+        # The grid caches both its position list and a bit-packed form,
+        # so asList() is a cache read and count() is a single popcount.
+        foodGrid = self.getFood(successor)
+        foodList = foodGrid.asList()
 
         # This should always be True, but better safe than sorry.
+        # The reduction streams through map() with no intermediate list.
         if len(foodList) > 0:
-            myPos = successor.getAgentState(self.index).getPosition()
-            minDistance = min([self.getMazeDistance(myPos, food) for food in foodList])
-            features["remainingFood"] = len(foodList)
+            minDistance = min(map(distTo, foodList))
+            features["remainingFood"] = foodGrid.count()
             features["distanceToFood"] = minDistance
-            features["densityFood"] = self.calculateDensityValue(successor, False)
+
+            # The density scan is the most expensive feature, and there are
+            # states where it cannot change the decision: an adjacent
+            # defender saturates the sum through normalValue, and a couple
+            # of stray pellets have no meaningful clustering.
+            if (minNormal is None or minNormal > 1) and len(foodList) >= 3:
+                features["densityFood"] = self.calculateDensityValue(successor, False)
+
         # Discourage stop action
         if action == Directions.STOP:
             features["stop"] = 1
 
         # Discourage moving backwards
-        rev = Directions.REVERSE[gameState.getAgentState(self.index).getDirection()]
+        rev = _REVERSE[gameState.getAgentState(self.index).getDirection()]
         if action == rev:
             features["reverse"] = 1
 
@@ -81,9 +559,7 @@ class OffensiveAgent(ReflexCaptureAgent):
         capsuleList = self.getCapsules(gameState)
         minCapsule = -100000
         if capsuleList:
-            minCapsule = min(
-                [self.getMazeDistance(myPos, capsule) for capsule in capsuleList]
-            )
+            minCapsule = min(map(distTo, capsuleList))
 
         # Set feature value for closest capsule if capsule exists in game
         if minCapsule != -100000:
@@ -92,120 +568,70 @@ class OffensiveAgent(ReflexCaptureAgent):
             else:
                 features["distanceToCapsules"] = minCapsule
 
-        # Initialize variables for computing defenders and invaders feature
-        enemies = [successor.getAgentState(i) for i in self.getOpponents(successor)]
-        defenders = [
-            a for a in enemies if not a.isPacman() and a.getPosition() is not None
-        ]
-        invaders = [a for a in enemies if a.isPacman() and a.getPosition() is not None]
-        normalVal = 0
-        scared = []
-        normal = []
-
-        if defenders:
-            # Append to normal and scared the normal or scared defending agents
-            for i in defenders:
-                if i.getScaredTimer() != 0:
-                    scared.append(i)
-                else:
-                    normal.append(i)
-
-        # Calculate feature for normal (not scared) enemy defending agents
-        if normal:
-            distsNormal = [self.getMazeDistance(myPos, a.getPosition()) for a in normal]
-            normalVal = min(distsNormal)
-            features["normalValue"] = normalVal
-            if normalVal <= 1:
-                features["normalValue"] = -100000
-
-        # Calculate minimum distance to scared enemy defending agents
-        if scared:
-            distsScared = [self.getMazeDistance(myPos, a.getPosition()) for a in scared]
-
-            # Update scaredValue if fits requirements
-            if min(distsScared) == 0:
-                features["scaredValue"] = 1
-
-        # Calculate the invaderValue
-        if invaders:
-            distsInvaders = [
-                self.getMazeDistance(myPos, a.getPosition()) for a in invaders
-            ]
-            features["invaderValue"] = min(distsInvaders)
-
-        # Include numInvaders so it would kill enemy pacman when they're invading
-        features["numInvaders"] = len(invaders)
-
         return features
 
-    def getDensityDict(self, gameState, d=False):
-        # Initialize variables for the density dictionary
-        foodGrid = None
-        densities = {}
-
+    def getDensityCounts(self, gameState, d=False):
         # Decide food to look at based on defense or not defense
         if d:
             foodGrid = self.getFoodYouAreDefending(gameState)
         else:
             foodGrid = self.getFood(gameState)
 
-        # Determine bounds of the x and y of grid
-        bounds = (foodGrid.getWidth(), foodGrid.getHeight())
-
-        # Iterate through each food in the foodList
-        for x1, y1 in foodGrid.asList():
-
-            # Iterate through the x and y range and see if food exists
+        # Most states scored in a turn share their food layout, and the
+        # grid's hash is cached, so one lookup usually replaces the whole
+        # window scan below.
+        cacheKey = (d, hash(foodGrid))
+        entry = self._densityCache.get(cacheKey)
+        if entry is not None:
+            return entry
+
+        windows = self._windows
+
+        # One count per food cell, parallel to the grid's cached food list -
+        # no dict intermediate, just two flat lists for the consumer to zip.
+        # The grid stores each column as a contiguous list, so a window
+        # column is one precompiled slice plus one C-level count instead of
+        # an interpreted probe per cell.
+        foodList = foodGrid.asList()
+        counts = []
+        for pos in foodList:
             foodCount = 0
-            for x2 in range(max(1, x1 - 2), min(bounds[0], x1 + 2)):
-                for y2 in range(max(1, y1 - 2), min(bounds[1], y1 + 2)):
-                    if x2 < bounds[0] and x2 > 0 and y2 < bounds[1] and y2 > 0:
-                        if foodGrid[x2][y2]:
-                            foodCount += 1
+            for x2, ys in windows[pos[0]][pos[1]]:
+                foodCount += foodGrid[x2][ys].count(True)
 
-            # Add to densities dictionary
-            densities[(x1, y1)] = foodCount
+            counts.append(foodCount)
 
-        # Returns a dictionary with (key, value) as (position, foodFound)
-        # near the key's position.
-        return densities
+        entry = (foodList, counts)
+        self._densityCache[cacheKey] = entry
+        return entry
 
     def calculateDensityValue(self, gameState, d=False):
-        # Get densities dictionary, position, and initialize returned value
-        densities = self.getDensityDict(gameState, d)
-        densityCalculation = 0
+        # Get density counts (parallel to the food positions) and position
+        foodList, counts = self.getDensityCounts(gameState, d)
         myPos = gameState.getAgentState(self.index).getPosition()
 
-        # Iterate through densitity keys and multiply by distance from agent
-        for key in densities.keys():
-            densityCalculation += self.getMazeDistance(myPos, key) * densities[key]
-        densityCalculation = 1.0 / densityCalculation
+        # One precomputed distance row serves every food cell below,
+        # replacing a getMazeDistance call (and its snapping checks) apiece.
+        distTo = self.mazeDistancesFrom(myPos).__getitem__
+
+        # Fuse distance and density into one zipped accumulation pass.
+        densityCalculation = sum(
+            distTo(pos) * count for pos, count in zip(foodList, counts)
+        )
+
+        # Standing on the last clump of food makes the weighted sum zero;
+        # return the best possible value instead of dividing by it.
+        if densityCalculation == 0:
+            return 1.0
 
         # Return accumulated variable
-        return densityCalculation
+        return 1.0 / densityCalculation
 
     def getWeights(self, gameState, action):
-        # To silence warnings
-        gameState = gameState
-        action = action
-
-        # return weights
-        return {
-            "successorScore": 200,
-            "invaderValue": -50,
-            "numInvaders": -1000,
-            "distanceToFood": -10,
-            "remainingFood": -1,
-            "distanceToCapsules": -2,
-            "stop": -100,
-            "reverse": -20,
-            "normalValue": 2,
-            "scaredValue": 100000,
-            "densityFood": 300,
-        }
-
-
-class DefensiveAgent(ReflexCaptureAgent):
+        return _OFFENSIVE_WEIGHTS
+
+
+class DefensiveAgent(MiniMaxReflexCaptureAgent):
     """
     CREDIT: Part of this code comes from:
         pacai.agents.capture.offense.OffensiveReflexiveAgent
@@ -229,24 +655,51 @@ class DefensiveAgent(ReflexCaptureAgent):
     def registerInitialState(self, gameState):
         super().registerInitialState(gameState)
 
-        # Initialize walls
-        walls = gameState.getWalls().asList()
+        # The board is ringed by walls, so the extreme wall coordinates are
+        # just the grid bounds - no need to scan the whole wall list for them.
+        walls = gameState.getWalls()
 
-        # Find x coordinate edge
-        x = max([w[0] for w in walls]) / 2
+        # Find x coordinate edge.
+        # Integer division matters: these points are compared against integer
+        # grid positions, and the old float division produced patrol points
+        # the agent could never actually stand on.
+        x = (walls.getWidth() - 1) // 2
         if not self.red:
             x += 2
 
         # Create y coordinate edge
-        topY = max([w[1] for w in walls])
-        upperEdge = topY * 2 / 3
-        lowerEdge = topY / 3
-
-        self.edges = [(x, upperEdge), (x, lowerEdge)]
+        topY = walls.getHeight() - 1
+        upperEdge = (topY * 2) // 3
+        lowerEdge = topY // 3
+
+        # Snap each patrol point to the nearest open cell, so the maze
+        # distances the edge feature asks for always have a reachable target.
+        self.edges = [
+            self._nearestOpenCell(walls, x, upperEdge),
+            self._nearestOpenCell(walls, x, lowerEdge),
+        ]
 
         # False when travelling to bottom, True when travelling top
         self.edge = False
 
+    def _nearestOpenCell(self, walls, x, y):
+        """
+        Get the open cell closest (by manhattan distance) to (x, y).
+        """
+
+        width = walls.getWidth()
+        height = walls.getHeight()
+
+        for radius in range(width + height):
+            for dx in range(-radius, radius + 1):
+                dy = radius - abs(dx)
+                for cy in (y - dy, y + dy):
+                    cx = x + dx
+                    if 0 <= cx < width and 0 <= cy < height and not walls[cx][cy]:
+                        return (cx, cy)
+
+        return (x, y)
+
     def getFeatures(self, gameState, action):
         features = {}
 
@@ -260,13 +713,33 @@ class DefensiveAgent(ReflexCaptureAgent):
             features["onDefense"] = 0
 
         # Computes distance to invaders we can see.
-        enemies = [successor.getAgentState(i) for i in self.getOpponents(successor)]
-        invaders = [a for a in enemies if a.isPacman() and a.getPosition() is not None]
-        features["numInvaders"] = len(invaders)
+        # One fused pass counts the invaders and tracks the nearest one,
+        # instead of building an intermediate list and walking it again.
+        numInvaders = 0
+        minInvader = None
+        distTo = None
+
+        getAgentState = successor.getAgentState
+        for i in self.opponents:
+            a = getAgentState(i)
+            pos = a.getPosition()
+            if not a.isPacman() or pos is None:
+                continue
+
+            numInvaders += 1
+
+            # The distance row is only fetched once an invader is seen.
+            if distTo is None:
+                distTo = self.mazeDistancesFrom(myPos).__getitem__
+
+            dist = distTo(pos)
+            if minInvader is None or dist < minInvader:
+                minInvader = dist
+
+        features["numInvaders"] = numInvaders
 
-        if len(invaders) > 0:
-            dists = [self.getMazeDistance(myPos, a.getPosition()) for a in invaders]
-            features["invaderDistance"] = min(dists)
+        if numInvaders > 0:
+            features["invaderDistance"] = minInvader
         else:
             if self.edge and myPos == self.edges[0]:
                 self.edge = False
@@ -278,7 +751,7 @@ class DefensiveAgent(ReflexCaptureAgent):
         if action == Directions.STOP:
             features["stop"] = 1
 
-        rev = Directions.REVERSE[gameState.getAgentState(self.index).getDirection()]
+        rev = _REVERSE[gameState.getAgentState(self.index).getDirection()]
         if action == rev:
             features["reverse"] = 1
 
@@ -286,16 +759,4 @@ class DefensiveAgent(ReflexCaptureAgent):
         return features
 
     def getWeights(self, gameState, action):
-        # To silence warnings
-        gameState = gameState
-        action = action
-
-        # return weights
-        return {
-            "numInvaders": -1000,
-            "onDefense": 100,
-            "invaderDistance": -200,
-            "stop": -100,
-            "reverse": -10,
-            "edge": -10,
-        }
+        return _DEFENSIVE_WEIGHTS
@@ -94,14 +94,19 @@ class QLearningAgent(ReinforcementAgent):
         if not actions:
             return (0.0, None)
 
-        bestAction = (-float('inf'), None)
+        # Track the running max in two locals; rebuilding a (value, action)
+        # tuple on every improvement allocates for nothing, and this runs for
+        # every step of every training episode.
+        bestValue = -float('inf')
+        bestAction = None
 
         for action in actions:
             val = self.getQValue(state, action)
-            if val > bestAction[0]:
-                bestAction = (val, action)
+            if val > bestValue:
+                bestValue = val
+                bestAction = action
 
-        return bestAction
+        return (bestValue, bestAction)
 
     def getAction(self, state):
         actions = self.getLegalActions(state)
@@ -184,7 +189,14 @@ class ApproximateQAgent(PacmanQAgent):
         features = self.featExtractor.getFeatures(self, state, action)
 
         # Q(s, a) = w * featureVector
-        return sum([features[feature] * self.getWeights(feature) for feature in features])
+        # One pass over the items, reading the weight dict directly instead of
+        # going through a method call (and a second dict lookup) per feature.
+        getWeight = self.weights.get
+        qValue = 0.0
+        for feature, value in features.items():
+            qValue += value * getWeight(feature, 0.0)
+
+        return qValue
 
     # used pseudocode from professor on Piazza
     def update(self, state, action, nextState, reward):
@@ -192,11 +204,19 @@ class ApproximateQAgent(PacmanQAgent):
         discount = self.getDiscountRate()
         features = self.featExtractor.getFeatures(self, state, action)
 
+        # Compute the current Q-value from the features extracted above;
+        # going through getQValue would extract the same features a second
+        # time, and this runs once per training step.
+        getWeight = self.weights.get
+        oldQVal = 0.0
+        for feature, value in features.items():
+            oldQVal += value * getWeight(feature, 0.0)
+
         newQVal = reward + discount * self.getValue(nextState)
-        correction = alpha * (newQVal - self.getQValue(state, action))
+        correction = alpha * (newQVal - oldQVal)
 
         for feature, value in features.items():
-            self.weights[feature] = self.getWeights(feature) + correction * value
+            self.weights[feature] = getWeight(feature, 0.0) + correction * value
 
     def final(self, state):
         """
@@ -12,11 +12,18 @@ def genericSearch(problem, dataStructure, heuristic = None):
     and returns a list of actions to reach the goal.
     """
 
+    # Resolved once up front: the container type and the starting state are
+    # loop-invariant, and both were being recomputed on hot paths (an
+    # isinstance check per successor push, a startingState() call per step
+    # of the path reconstruction).
+    isPriority = isinstance(dataStructure, PriorityQueue)
+    startingState = problem.startingState()
+
     # If the data structure is a priority queue, we need to push a tuple of (state, cost).
-    if isinstance(dataStructure, PriorityQueue):
-        dataStructure.push((problem.startingState(), 0), 0)
+    if isPriority:
+        dataStructure.push((startingState, 0), 0)
     else:
-        dataStructure.push((problem.startingState(), 0))
+        dataStructure.push((startingState, 0))
 
     path = {}
     visited = set()
@@ -27,7 +34,7 @@ def genericSearch(problem, dataStructure, heuristic = None):
         if problem.isGoal(state):
             actions = []
             # Reconstruct the path by following the parent pointers.
-            while state != problem.startingState():
+            while state != startingState:
                 state, action = path[state]
                 actions.append(action)
             # Return the reversed list of actions.
@@ -40,15 +47,21 @@ def genericSearch(problem, dataStructure, heuristic = None):
             for successor in problem.successorStates(state):
                 cost = successor[2] + curr_cost
                 # Add the state and backwards cost to the data structure.
-                if isinstance(dataStructure, PriorityQueue):
+                if isPriority:
                     # If a heuristic is provided (from A*), add it to the cost.
+                    # Note the parenthesization: the conditional picks the
+                    # heuristic term, not the whole priority. The old form
+                    # pushed priority 0 for every node when no heuristic was
+                    # given, making uniform cost search pop in insertion
+                    # order instead of by path cost.
                     dataStructure.push((successor[0], cost),
-                        cost + (heuristic(successor[0], problem)) if heuristic else 0)
+                        cost + (heuristic(successor[0], problem) if heuristic else 0))
                 else:
                     dataStructure.push((successor[0], cost))
-                # Add the parent pointer to the path.
-                if successor[0] not in path:
-                    path[successor[0]] = (state, successor[1])
+                # Add the parent pointer to the path, keeping the first-seen
+                # parent. setdefault does the membership test and the insert
+                # in one hash lookup instead of two.
+                path.setdefault(successor[0], (state, successor[1]))
 
     # If the data structure is empty, there is no solution.
     return []
@@ -5,6 +5,7 @@ You will complete their implementations.
 Good luck and happy searching!
 """
 
+import collections
 import logging
 
 from pacai.core.actions import Actions
@@ -66,39 +67,76 @@ class CornersProblem(SearchProblem):
             if not startingGameState.hasFood(*corner):
                 logging.warning('Warning: no food in corner ' + str(corner))
 
+        # Optimal-order tour costs for cornersHeuristic, precomputed once.
+        # tourCosts[i][mask] is the cheapest manhattan-distance tour that
+        # starts at corner i and visits every corner in mask (a bitmask over
+        # self.corners) - a 4 x 16 table, so the DP below is trivial.
+        pairs = [[distance.manhattan(a, b) for b in self.corners] for a in self.corners]
+
+        self.tourCosts = [[0] * 16 for _ in range(4)]
+        for mask in range(1, 16):
+            for i in range(4):
+                best = None
+                for j in range(4):
+                    if (mask & (1 << j)):
+                        cost = pairs[i][j] + self.tourCosts[j][mask & ~(1 << j)]
+                        if (best is None or cost < best):
+                            best = cost
+
+                self.tourCosts[i][mask] = best
+
+        # The walls never change, so each open cell's legal moves can be
+        # resolved once here instead of re-deriving direction vectors and
+        # probing the walls grid on every expansion.
+        self._adjacency = {}
+        for x in range(self.walls.getWidth()):
+            for y in range(self.walls.getHeight()):
+                if (not self.walls[x][y]):
+                    neighbors = []
+                    for action in Directions.CARDINAL:
+                        dx, dy = Actions.directionToVector(action)
+                        nextx, nexty = int(x + dx), int(y + dy)
+                        if (not self.walls[nextx][nexty]):
+                            neighbors.append((nextx, nexty, action))
+
+                    self._adjacency[(x, y)] = tuple(neighbors)
+
+        # Map each corner to its bit for the visited mask carried in the state.
+        self._cornerIndex = {corner: i for i, corner in enumerate(self.corners)}
+
     def startingState(self):
         """
         Returns the start state.
         """
-        return (self.startingPosition, tuple([False, False, False, False]))
+
+        # A flat (x, y, visitedMask) tuple of ints: a nested position tuple
+        # would make every visited-set probe hash recursively.
+        x, y = self.startingPosition
+        return (x, y, 0)
 
     def isGoal(self, state):
         """
         Returns whether this search state is a goal state of the problem.
         """
-        coords, corners = state
-        return all(corners)
+        return state[2] == 0b1111
 
     def successorStates(self, state):
         """
         Returns successor states, the actions they require, and a cost of 1.
         """
         successors = []
-        coords, corners = state
+        x, y, corners = state
+        coords = (x, y)
 
-        for action in Directions.CARDINAL:
-            x, y = coords
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
+        for nextx, nexty, action in self._adjacency[coords]:
+            cost = 1
 
-            if (not self.walls[nextx][nexty]):
-                nextState = (nextx, nexty)
-                cost = 1
-                nextCorners = list(corners)
-                if nextState in self.corners:
-                    nextCorners[self.corners.index(nextState)] = True
+            # Visited corners live in a 4-bit mask, so marking one is a
+            # single OR with no list/tuple churn per successor.
+            cornerBit = self._cornerIndex.get((nextx, nexty))
+            nextCorners = corners if (cornerBit is None) else (corners | (1 << cornerBit))
 
-                successors.append(((nextState, tuple(nextCorners)), action, cost))
+            successors.append(((nextx, nexty, nextCorners), action, cost))
 
         # Bookkeeping for display purposes (the highlight in the GUI).
         self._numExpanded += 1
@@ -139,31 +177,51 @@ def cornersHeuristic(state, problem):
     (You need not worry about consistency for this heuristic to receive full credit.)
     """
 
-    # based on pseudocode given in section, to which I give credit
+    x, y, corners = state
 
-    coords, corners = state
+    # Bitmask of the corners that have not yet been visited.
+    mask = 0b1111 & ~corners
 
-    # heuristic is the distance from the current position to the closest corner
-    # then it adds the distance from that corner to the next closest corner, and so on
-    # until all corners have been accounted for
-    heuristic = 0
+    if (mask == 0):
+        return 0
+
+    # Walk to some first corner, then follow the best precomputed ordering
+    # through the rest. Manhattan distances lower-bound the real paths, so
+    # this stays admissible, and taking the optimal order (instead of greedy
+    # nearest-neighbor chaining) keeps it a true lower bound on every tour.
+    best = None
+    for i in range(4):
+        if (mask & (1 << i)):
+            # Manhattan distance, inlined: this runs per unvisited corner on
+            # every A* expansion, and the arithmetic is cheaper than the call.
+            cornerX, cornerY = problem.corners[i]
+            cost = abs(cornerX - x) + abs(cornerY - y) + problem.tourCosts[i][mask & ~(1 << i)]
+            if (best is None or cost < best):
+                best = cost
+
+    return best
+
+def _mazeDistancesFrom(position, walls):
+    """
+    BFS from one position to every reachable cell, returning a dict mapping
+    position to maze distance. One run answers every later query from the
+    same source, where `pacai.core.distance.maze` pays a full search per pair.
+    """
 
-    # obtain the corners that have not yet been visited
-    remaining_corners = [problem.corners[corner] for corner in range(len(problem.corners))
-                         if not corners[corner]]
+    dist = {position: 0}
+    queue = collections.deque([position])
 
-    # initialize the first coordinate to compare to
-    reference = coords
+    while queue:
+        node = queue.popleft()
+        nodeDist = dist[node] + 1
+        x, y = node
 
-    # iterate through each corner, finding the closest one to the comparison position
-    # changing the comparison coordinates and adding the distance to the heuristic in each iteration
-    while remaining_corners:
-        minDist, reference = min(((distance.manhattan(reference, corner), corner)
-                                  for corner in remaining_corners), key=lambda x: x[0])
-        heuristic += minDist
-        remaining_corners.remove(reference)
+        for other in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if (other not in dist and not walls[other[0]][other[1]]):
+                dist[other] = nodeDist
+                queue.append(other)
 
-    return heuristic
+    return dist
 
 def foodHeuristic(state, problem):
     """
@@ -198,20 +256,50 @@ def foodHeuristic(state, problem):
 
     foodList = foodGrid.asList()
 
-    # initialize the gamestate to be used in the maze distance calculation
-    gamestate = problem.startingGameState
-
     if not foodList:
         return 0
 
-    # find the maximum distance between any two food pellets, and store the their positions
-    maxDist, maxFood1, maxFood2 = max(((distance.manhattan(food1, food2), food1, food2)
-                    for food1 in foodList for food2 in foodList), key=lambda x: x[0])
+    # A* keeps asking about the same positions under different food grids,
+    # so one BFS per position (cached for the life of the problem) replaces
+    # a fresh maze search for every food target below.
+    mazeRows = problem.heuristicInfo.setdefault('mazeRows', {})
+    mazeRow = mazeRows.get(position)
+    if mazeRow is None:
+        mazeRow = mazeRows[position] = _mazeDistancesFrom(position, problem.walls)
+
+    # With one pellet the pair scan degenerates to a zero-length self-pair,
+    # and with two the pair is fixed; answer directly in the endgame instead
+    # of running the ranking machinery below.
+    if (len(foodList) == 1):
+        return mazeRow[foodList[0]]
+
+    if (len(foodList) == 2):
+        food1, food2 = foodList
+        return distance.manhattan(food1, food2) + min(mazeRow[food1], mazeRow[food2])
+
+    # The food set only shrinks during the search, so the pair ranking from
+    # the first call keeps serving every later one: walk the list sorted by
+    # descending distance and the first pair whose endpoints both survive is
+    # the current maximum. This replaces an O(F^2) scan per A* node with an
+    # amortized O(1) probe.
+    pairs = problem.heuristicInfo.get('foodPairs')
+    if pairs is None:
+        # Unordered pairs only: distance is symmetric, so enumerating both
+        # orders (and the zero-distance self-pairs) just doubled the build.
+        pairs = sorted(((distance.manhattan(food1, food2), food1, food2)
+                        for i, food1 in enumerate(foodList)
+                        for food2 in foodList[i + 1:]), reverse=True)
+        problem.heuristicInfo['foodPairs'] = pairs
+
+    maxDist, maxFood1, maxFood2 = 0, foodList[0], foodList[0]
+    for dist, food1, food2 in pairs:
+        if foodGrid[food1[0]][food1[1]] and foodGrid[food2[0]][food2[1]]:
+            maxDist, maxFood1, maxFood2 = dist, food1, food2
+            break
 
     # return the maximum distance between any two food pellets, plus the distance
     # to the closest one from PacMan's current position
-    return maxDist + min(distance.maze(position, maxFood1, gamestate),
-                         distance.maze(position, maxFood2, gamestate))
+    return maxDist + min(mazeRow[maxFood1], mazeRow[maxFood2])
 
 
 class ClosestDotSearchAgent(SearchAgent):
@@ -284,6 +372,10 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         # Store the food for later reference.
         self.food = gameState.getFood()
 
+        # A set of positions answers the goal test with one hash probe on the
+        # state tuple, with no unpacking or nested list indexing.
+        self.foodPositions = set(self.food.asList())
+
     def isGoal(self, state):
         """
         The state is Pacman's position.
@@ -291,8 +383,7 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         """
 
         # if the current position is a food, return true
-        x, y = state
-        return self.food[x][y]
+        return state in self.foodPositions
 
 class ApproximateSearchAgent(BaseAgent):
     """
@@ -1,3 +1,5 @@
+import random
+
 from pacai.agents.learning.value import ValueEstimationAgent
 
 class ValueIterationAgent(ValueEstimationAgent):
@@ -30,33 +32,165 @@ class ValueIterationAgent(ValueEstimationAgent):
     you should return None.
     """
 
-    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, **kwargs):
+    def __init__(self, index, mdp, discountRate = 0.9, iters = 100,
+            actionSample = None, **kwargs):
         super().__init__(index, **kwargs)
 
         self.mdp = mdp
         self.discountRate = discountRate
         self.iters = iters
-        self.values = {}  # A dictionary which holds the q-values for each state.
 
-        # Initialize each state's value to be 0.
-        for state in mdp.getStates():
-            self.values[state] = 0.0
+        # Walk the MDP once up front and flatten it into per-(state, action)
+        # transition tables (the Bellman operator's matrices, as plain tuples).
+        # The sweeps below then run over these instead of paying a
+        # getTransitionStatesAndProbs and getReward dispatch per transition
+        # per iteration. Each entry holds the expected immediate reward
+        # (rewards depend only on the static (s, a, s') triples, so their
+        # probability-weighted sum never changes) plus parallel (probs,
+        # nextStates) tuples, so the inner sums walk flat sequences and skip
+        # the reward arithmetic entirely.
+        self._states = list(mdp.getStates())
+        self._actions = {}
+        self._transitions = {}
+        for state in self._states:
+            actions = mdp.getPossibleActions(state)
+            self._actions[state] = actions
+            for action in actions:
+                probs = []
+                nextStates = []
+                expectedReward = 0.0
+                for nextState, prob in mdp.getTransitionStatesAndProbs(state, action):
+                    probs.append(prob)
+                    nextStates.append(nextState)
+                    expectedReward += prob * mdp.getReward(state, action, nextState)
+
+                self._transitions[(state, action)] = \
+                    (expectedReward, tuple(probs), tuple(nextStates))
+
+        # The solver works in index space: values live in a flat list
+        # addressed by a dense state id, so the sweeps gather successor
+        # values by list index instead of hashing state tuples on every
+        # transition. getValue translates through the index dict.
+        stateIndex = {state: i for i, state in enumerate(self._states)}
+        self._stateIndex = stateIndex
+
+        # Per state id, the (expectedReward, probs, nextIndexes) entry for
+        # each of its actions, with successor states resolved to ids.
+        sweepEntries = []
+        for state in self._states:
+            entries = []
+            for action in self._actions[state]:
+                expectedReward, probs, nextStates = self._transitions[(state, action)]
+
+                nextIndexes = []
+                for nextState in nextStates:
+                    index = stateIndex.get(nextState)
+                    if index is None:
+                        # A successor outside getStates(); give it a slot that
+                        # keeps its value pinned at 0, as before.
+                        index = stateIndex[nextState] = len(stateIndex)
+                    nextIndexes.append(index)
+
+                entries.append((expectedReward, probs, tuple(nextIndexes)))
+            sweepEntries.append(entries)
 
-        # Perform value iteration.
+        # Initialize each state's value to be 0.
+        self._values = [0.0] * len(stateIndex)
+
+        # Predecessor lists for prioritized sweeping: for each state id, the
+        # (predecessor id, probability) pairs that can transition into it.
+        predecessors = [[] for _ in range(len(stateIndex))]
+        for index, entries in enumerate(sweepEntries):
+            for expectedReward, probs, nextIndexes in entries:
+                for prob, nextIndex in zip(probs, nextIndexes):
+                    predecessors[nextIndex].append((index, prob))
+
+        # Perform value iteration with in-place (Gauss-Seidel) updates:
+        # states later in a sweep immediately see the successor values
+        # refreshed earlier in the same sweep, which tightens the contraction
+        # per sweep, and no temporary dict is allocated per iteration.
+        # Sweeps also stop early once the largest per-state change (the
+        # Bellman residual, in sup-norm) falls under the tolerance computed
+        # below, since further sweeps cannot meaningfully move the values.
+        discount = self.discountRate
+
+        # For a discount-factor contraction, a residual under
+        # epsilon * (1 - gamma) / (2 * gamma) bounds the sup-norm distance
+        # between the current values and the fixed point by epsilon
+        # (Banach fixed-point bound), so stopping there is provably safe.
+        epsilon = 1e-5
+        if 0.0 < discount < 1.0:
+            tolerance = epsilon * (1.0 - discount) / (2.0 * discount)
+        else:
+            tolerance = epsilon
+        values = self._values
+        # With actionSample set, each sweep maximizes over only that many
+        # randomly sampled actions per state, keeping the running best
+        # (doubly-asynchronous value iteration). The default considers every
+        # action, which is exact.
+        # Each sweep accumulates, per state, how much probability-weighted
+        # change flowed into it from its successors, and the next sweep
+        # visits states in decreasing order of that priority. Large
+        # corrections therefore reach their predecessors before the noise
+        # does (prioritized sweeping, batched per sweep).
+        sweepOrder = list(range(len(self._states)))
         for _ in range(iters):
-            temp = {}
-            for state in mdp.getStates():
-                actions = mdp.getPossibleActions(state)
-                if len(actions) > 0:
-                    temp[state] = max([self.getQValue(state, action) for action in actions])
-            self.values = temp
+            delta = 0.0
+            priorities = [0.0] * len(values)
+            for index in sweepOrder:
+                entries = sweepEntries[index]
+                if len(entries) > 0:
+                    sweepActions = entries
+                    if (actionSample is not None and actionSample < len(entries)):
+                        sweepActions = random.sample(entries, actionSample)
+
+                    newValue = None
+                    for expectedReward, probs, nextIndexes in sweepActions:
+                        qValue = expectedReward + discount * sum(
+                            prob * values[nextIndex]
+                            for prob, nextIndex in zip(probs, nextIndexes))
+                        if newValue is None or qValue > newValue:
+                            newValue = qValue
+
+                    if sweepActions is not entries:
+                        # A sampled max can only raise the running estimate.
+                        newValue = max(newValue, values[index])
+
+                    change = abs(newValue - values[index])
+                    if change > delta:
+                        delta = change
+
+                    values[index] = newValue
+
+                    if change != 0.0:
+                        for predecessor, prob in predecessors[index]:
+                            priorities[predecessor] += prob * change
+
+            if delta < tolerance:
+                break
+
+            sweepOrder = sorted(range(len(self._states)),
+                key = priorities.__getitem__, reverse = True)
+
+        # One more Q pass over the final values, cached so runtime queries
+        # answer from a dict probe instead of re-summing transitions.
+        self._qValues = {}
+        for state, entries in zip(self._states, sweepEntries):
+            for action, (expectedReward, probs, nextIndexes) in zip(self._actions[state], entries):
+                self._qValues[(state, action)] = expectedReward + discount * sum(
+                    prob * values[nextIndex]
+                    for prob, nextIndex in zip(probs, nextIndexes))
 
     def getValue(self, state):
         """
         Return the value of the state (computed in __init__).
         """
 
-        return self.values.get(state, 0.0)
+        index = self._stateIndex.get(state)
+        if index is None:
+            return 0.0
+
+        return self._values[index]
 
     def getAction(self, state):
         """
@@ -70,16 +204,47 @@ class ValueIterationAgent(ValueEstimationAgent):
         Returns the q-value of the state action pair.
         """
 
-        transitions = self.mdp.getTransitionStatesAndProbs(state, action)
-        return sum([prob * (self.mdp.getReward(state, action, nextState)
-            + self.discountRate * self.getValue(nextState)) for nextState, prob in transitions])
+        qValue = self._qValues.get((state, action))
+        if qValue is not None:
+            return qValue
+
+        discount = self.discountRate
+        stateTransitions = self._transitions.get((state, action))
+        if stateTransitions is None:
+            # A pair not seen while flattening the MDP; ask the MDP directly.
+            return sum(prob * (self.mdp.getReward(state, action, nextState)
+                + discount * self.getValue(nextState))
+                for nextState, prob in self.mdp.getTransitionStatesAndProbs(state, action))
+
+        expectedReward, probs, nextStates = stateTransitions
+        return expectedReward + discount * sum(prob * self.getValue(nextState)
+            for prob, nextState in zip(probs, nextStates))
 
     def getPolicy(self, state):
         """
         Returns the policy at the state (no exploration).
         """
 
-        actions = self.mdp.getPossibleActions(state)
+        actions = self._actions.get(state)
+        if actions is None:
+            actions = self.mdp.getPossibleActions(state)
+
         if not len(actions):
             return None
-        return max(actions, key = lambda action: self.getQValue(state, action))
+
+        # Running argmax over the cached Q-values; a key lambda would pay a
+        # function call (and a bound-method dispatch) per action. First
+        # maximum wins, matching max()'s tie-breaking.
+        qValuesGet = self._qValues.get
+        bestValue = None
+        bestAction = None
+        for action in actions:
+            qValue = qValuesGet((state, action))
+            if qValue is None:
+                qValue = self.getQValue(state, action)
+
+            if bestValue is None or qValue > bestValue:
+                bestValue = qValue
+                bestAction = action
+
+        return bestAction